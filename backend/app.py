@@ -1,19 +1,27 @@
 """
-Flask entrypoint for the Precision RAG backend.
+FastAPI entrypoint for the Precision RAG backend.
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import shutil
+from pathlib import Path
+from typing import BinaryIO, Iterator
 
-from flask import Flask, jsonify, request
-from flask_cors import CORS
+import orjson
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
 from werkzeug.utils import secure_filename
 
 from backend.config import settings
 from backend.services.ingest import process_pdf
-from backend.services.query import execute_query
+from backend.services.query import execute_query, execute_query_stream
 
 
 logging.basicConfig(
@@ -25,11 +33,35 @@ logger = logging.getLogger(__name__)
 # Suppress ChromaDB telemetry errors (harmless but noisy)
 logging.getLogger("chromadb.telemetry.product.posthog").setLevel(logging.CRITICAL)
 
+# Copy uploads to disk in 1 MiB blocks instead of the small default buffer.
+UPLOAD_COPY_BUFFER = 1 << 20
+
+
+class QueryIn(BaseModel):
+    """Request body for /query."""
+
+    question: str = ""
+
+
+def _save_upload(stream: BinaryIO, target_path: Path) -> None:
+    with open(target_path, "wb") as fh:
+        shutil.copyfileobj(stream, fh, length=UPLOAD_COPY_BUFFER)
+
 
-def create_app() -> Flask:
+def _sse(event: str, data: dict) -> bytes:
+    """Encode one server-sent event."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+def create_app() -> FastAPI:
     """Application factory."""
-    app = Flask(__name__)
-    CORS(app)
+    app = FastAPI(title="Precision RAG", default_response_class=ORJSONResponse)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
     settings.chroma_path.mkdir(parents=True, exist_ok=True)
     settings.pdf_data_path.mkdir(parents=True, exist_ok=True)
 
@@ -39,42 +71,71 @@ def create_app() -> Flask:
         )
 
     @app.get("/health")
-    def health() -> tuple[dict, int]:
-        return {"status": "ok"}, 200
+    async def health() -> dict:
+        return {"status": "ok"}
 
     @app.post("/upload")
-    def upload_pdf() -> tuple[dict, int]:
-        file = request.files.get("file")
+    async def upload_pdf(file: UploadFile | None = File(None)):
         if not file:
-            return {"error": "No file provided."}, 400
+            return ORJSONResponse({"error": "No file provided."}, status_code=400)
 
-        filename = secure_filename(file.filename)
+        filename = secure_filename(file.filename or "")
         if not filename.lower().endswith(".pdf"):
-            return {"error": "Only PDF files are supported."}, 400
+            return ORJSONResponse(
+                {"error": "Only PDF files are supported."}, status_code=400
+            )
 
+        # Disk I/O and parsing are blocking; keep them off the event loop so
+        # /query stays responsive while a large PDF is ingested.
         target_path = settings.pdf_data_path / filename
-        file.save(target_path)
-        stats = process_pdf(target_path)
-        return {"message": "Ingestion complete.", "stats": stats}, 200
+        await run_in_threadpool(_save_upload, file.file, target_path)
+        stats = await run_in_threadpool(process_pdf, target_path)
+        return {"message": "Ingestion complete.", "stats": stats}
 
     @app.post("/query")
-    def query_rag() -> tuple[dict, int]:
-        payload = request.get_json(force=True, silent=True) or {}
-        question = (payload.get("question") or "").strip()
+    async def query_rag(payload: QueryIn):
+        question = payload.question.strip()
         if not question:
-            return {"error": "The 'question' field is required."}, 400
+            return ORJSONResponse(
+                {"error": "The 'question' field is required."}, status_code=400
+            )
 
         try:
-            answer, citations, _chunks = execute_query(question)
+            answer, citations, _chunks = await run_in_threadpool(
+                execute_query, question
+            )
         except Exception as exc:  # noqa: BLE001
             logger.exception("Query pipeline failed.")
-            return {"error": str(exc)}, 500
+            return ORJSONResponse({"error": str(exc)}, status_code=500)
 
         response = {
             "answer_text": answer,
             "citations": citations,
         }
-        return jsonify(response), 200
+        return response
+
+    @app.post("/query/stream")
+    async def query_rag_stream(payload: QueryIn):
+        question = payload.question.strip()
+        if not question:
+            return ORJSONResponse(
+                {"error": "The 'question' field is required."}, status_code=400
+            )
+
+        # A sync generator: Starlette iterates it in the thread pool, so the
+        # blocking retrieval and Gemini stream stay off the event loop.
+        def events() -> Iterator[bytes]:
+            try:
+                for event, data in execute_query_stream(question):
+                    if event == "delta":
+                        yield _sse("delta", {"text": data})
+                    else:
+                        yield _sse("citations", {"citations": data})
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Query pipeline failed.")
+                yield _sse("error", {"error": str(exc)})
+
+        return StreamingResponse(events(), media_type="text/event-stream")
 
     return app
 
@@ -83,6 +144,7 @@ app = create_app()
 
 
 if __name__ == "__main__":
-    port = int(os.environ.get("PORT", "5000"))
-    app.run(host="0.0.0.0", port=port, debug=True)
+    import uvicorn
 
+    port = int(os.environ.get("PORT", "5000"))
+    uvicorn.run("backend.app:app", host="0.0.0.0", port=port, reload=True)
@@ -15,16 +15,26 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR / ".env", override=False)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Settings:
     """Centralized configuration object."""
 
     gemini_api_key: str = os.getenv("GEMINI_API_KEY", "")
     chroma_path: Path = BASE_DIR / "vector_store"
     pdf_data_path: Path = (BASE_DIR / ".." / "data" / "pdfs").resolve()
+    # Rendering resolution for OCR; raise it (e.g. 300) for documents with tiny fonts.
+    ocr_dpi: int = int(os.getenv("OCR_DPI", "200"))
+    cache_dir: Path = Path(os.getenv("CACHE_DIR", str(BASE_DIR / ".cache")))
     chunk_size: int = int(os.getenv("CHUNK_SIZE", "1000"))
     chunk_overlap: int = int(os.getenv("CHUNK_OVERLAP", "150"))
     collection_name: str = os.getenv("CHROMA_COLLECTION", "engineering_docs")
+    # Must match the model the existing collection was built with; changing it
+    # requires clearing vector_store/ and re-uploading every PDF.
+    embedding_model: str = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    # Try slow pdfplumber table extraction before OCR on text-less pages.
+    enable_table_fallback: bool = os.getenv("ENABLE_TABLE_FALLBACK", "0").lower() in ("1", "true")
+    # Worker processes used to parse PDF pages; 0 means one per CPU core.
+    ingest_workers: int = int(os.getenv("INGEST_WORKERS", "0"))
 
     def validate(self) -> None:
         if not self.gemini_api_key:
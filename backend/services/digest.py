@@ -0,0 +1,31 @@
+"""
+Content fingerprints for ingested PDFs.
+
+Ingestion prefixes chunk ids with this tag and the OCR cache keys pages by
+it, so both must come from this one helper.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+from pathlib import Path
+
+
+@functools.lru_cache(maxsize=128)
+def _file_digest(pdf_path: str, mtime_ns: int, size: int) -> str:
+    """
+    Short SHA256 of the file contents.
+
+    mtime_ns and size only key the cache, so an unchanged file is hashed
+    once while a rewritten file is hashed again.
+    """
+    with open(pdf_path, "rb") as fh:
+        return hashlib.file_digest(fh, "sha256").hexdigest()[:12]
+
+
+def pdf_digest(pdf_path: str | Path) -> str:
+    """Return the content tag of a PDF; raises OSError if it cannot be read."""
+    stat = os.stat(pdf_path)
+    return _file_digest(str(pdf_path), stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,94 @@
+"""
+Embedding utilities for Precision RAG.
+
+Documents and queries are embedded here rather than by Chroma's per-collection
+embedding function, so ingestion can encode a whole batch in one model call.
+Vectors are only comparable within one model: a collection must be queried
+with the EMBEDDING_MODEL it was built with, so changing it means re-ingesting.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+from backend.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Recently embedded queries, so repeated questions skip the encoder entirely.
+_QUERY_CACHE_SIZE = 1024
+_query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+_query_cache_lock = threading.Lock()
+
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+
+def _get_encoder():
+    """Return the shared SentenceTransformer, loading it on first use."""
+    global _encoder
+    if _encoder is None:
+        # Uploads and queries arrive on the thread pool; only one may load it.
+        with _encoder_lock:
+            if _encoder is None:
+                _encoder = _load_encoder()
+    return _encoder
+
+
+def _load_encoder():
+    """Load the SentenceTransformer, in fp16 when a GPU is available."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model = SentenceTransformer(settings.embedding_model, device=device)
+    if device == "cuda":
+        model = model.half()
+    logger.info("Loaded embedding model %s on %s", settings.embedding_model, device)
+    return model
+
+
+def embed_texts(texts: List[str]) -> List[List[float]]:
+    """Embed a batch of texts with a single encoder call."""
+    if not texts:
+        return []
+    embeddings = _get_encoder().encode(
+        texts,
+        batch_size=128,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+    )
+    return embeddings.tolist()
+
+
+def embed_queries(queries: List[str]) -> List[List[float]]:
+    """
+    Embed user queries, reusing cached vectors for queries seen before.
+
+    Queries are keyed with whitespace collapsed, and all cache misses are
+    encoded together in one batch.
+    """
+    keys = [" ".join(query.split()) for query in queries]
+    vectors: Dict[str, List[float]] = {}
+    with _query_cache_lock:
+        for key in keys:
+            if key in _query_cache:
+                _query_cache.move_to_end(key)
+                vectors[key] = _query_cache[key]
+
+    misses = list(dict.fromkeys(key for key in keys if key not in vectors))
+    if misses:
+        vectors.update(zip(misses, embed_texts(misses)))
+        with _query_cache_lock:
+            for key in misses:
+                _query_cache[key] = vectors[key]
+                _query_cache.move_to_end(key)
+            while len(_query_cache) > _QUERY_CACHE_SIZE:
+                _query_cache.popitem(last=False)
+
+    return [vectors[key] for key in keys]
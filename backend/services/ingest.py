@@ -4,82 +4,388 @@ PDF ingestion utilities for Precision RAG.
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Set, Tuple
 
 import pdfplumber
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from backend.config import settings
-from backend.vector_store.client import get_collection
+from backend.services.digest import pdf_digest
+from backend.services.embeddings import embed_texts
 
 # Import OCR functionality (may not be available if dependencies are missing)
 try:
     from backend.services.ocr import (
         OCR_AVAILABLE,
+        disable_tesserocr,
+        extract_text_with_ocr_from_fitz_page,
         extract_text_with_ocr_from_pdfplumber_page,
     )
 except ImportError:
     OCR_AVAILABLE = False
+    disable_tesserocr = None  # type: ignore
+    extract_text_with_ocr_from_fitz_page = None  # type: ignore
     extract_text_with_ocr_from_pdfplumber_page = None  # type: ignore
 
+# PyMuPDF is optional - it is the fast text path, pdfplumber remains the fallback
+try:
+    import fitz  # PyMuPDF
+
+    FITZ_AVAILABLE = True
+except ImportError:
+    fitz = None  # type: ignore
+    FITZ_AVAILABLE = False
+
 
 logger = logging.getLogger(__name__)
 
+# Chunks buffered before each ChromaDB write. Every get/add is its own SQLite
+# transaction, and batches of a few hundred amortize that cost without
+# building oversized requests.
+_UPSERT_BATCH_SIZE = 200
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Logged once per document when a scanned page needs OCR but it is unavailable.
+_OCR_MISSING_MSG = (
+    "\n" + "=" * 70 + "\n"
+    "OCR DEPENDENCIES NOT AVAILABLE!\n"
+    "This PDF appears to be scanned (image-based).\n"
+    "To extract text from scanned PDFs, you MUST install:\n"
+    "\n"
+    "1. Python packages:\n"
+    "   pip install -r backend/requirements.txt\n"
+    "\n"
+    "2. Tesseract OCR (system binary):\n"
+    "   - Windows: https://github.com/UB-Mannheim/tesseract/wiki\n"
+    "   - macOS: brew install tesseract\n"
+    "   - Linux: sudo apt-get install tesseract-ocr\n"
+    "\n"
+    "3. Poppler (for PDF to image conversion):\n"
+    "   - Windows: https://github.com/oschwartz10612/poppler-windows/releases/\n"
+    "   - macOS: brew install poppler\n"
+    "   - Linux: sudo apt-get install poppler-utils\n"
+    "\n"
+    "Run 'python backend/check_ocr.py' to verify your setup.\n"
+    "See OCR_SETUP.md for detailed instructions.\n"
+    "=" * 70
+)
+
 
 def _normalize_text(text: str) -> str:
     """Normalize whitespace in extracted PDF text."""
-    return " ".join(text.split())
+    return _WHITESPACE_RE.sub(" ", text).strip()
 
 
-def _chunk_page_text(text: str) -> List[str]:
-    """Chunk text for a single page using RecursiveCharacterTextSplitter."""
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=settings.chunk_size,
-        chunk_overlap=settings.chunk_overlap,
+@functools.lru_cache(maxsize=4)
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """Build the text splitter once per (chunk_size, chunk_overlap) pair."""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
         separators=["\n\n", "\n", " ", ""],
     )
-    return splitter.split_text(text)
 
 
-def _find_chunk_bounds(
+def _chunk_page_text(text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
+    """Chunk text for a single page using RecursiveCharacterTextSplitter."""
+    return _get_splitter(chunk_size, chunk_overlap).split_text(text)
+
+
+def _compute_offsets(
     page_text: str,
-    chunk_text: str,
-    search_start: int,
-) -> Tuple[int, int, int]:
+    chunks: List[str],
+    chunk_overlap: int,
+) -> List[Tuple[int, int]]:
     """
-    Locate character offsets for chunk_text within page_text.
+    Locate (start, end) character offsets for each chunk within page_text.
 
-    Returns (start, end, new_search_start).
+    The splitter emits chunks in document order, and each chunk starts no
+    earlier than chunk_overlap characters before the previous one ended, so
+    a single forward-moving cursor is enough.
     """
-    idx = page_text.find(chunk_text, search_start)
-    if idx == -1:
-        idx = page_text.find(chunk_text)
-    if idx == -1:
-        # Fallback: treat as sequential chunk.
-        idx = len(page_text)
-    end_idx = idx + len(chunk_text)
-    next_search = max(0, end_idx - settings.chunk_overlap)
-    return idx, end_idx, next_search
+    offsets: List[Tuple[int, int]] = []
+    cursor = 0
+    for chunk_text in chunks:
+        start = page_text.find(chunk_text, cursor)
+        if start == -1:
+            # Fallback: treat as sequential chunk.
+            start = cursor
+        end = start + len(chunk_text)
+        offsets.append((start, end))
+        cursor = max(cursor, end - chunk_overlap)
+    return offsets
 
 
 def _chunk_sha(text: str) -> str:
     """Return SHA256 hash for deduplication."""
-    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return hashlib.sha256(
+        text.encode("utf-8", "surrogatepass"), usedforsecurity=False
+    ).hexdigest()
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    """
+    Start method for the page-parsing pool.
+
+    process_pdf() runs on a server thread, and forking a multi-threaded
+    process is unsafe, so workers come from a forkserver where the platform
+    has one. Its server preloads this module once, keeping per-upload worker
+    start-up cheap. Windows only has spawn.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _init_worker(log_level: int) -> None:
+    """
+    Configure a page-parsing worker process.
+
+    Workers start from a fresh interpreter, so logging is set up again to
+    match the server's, keeping per-page OCR messages visible.
+
+    Pages (and so OCR calls) already run one per worker, so each Tesseract
+    process is limited to a single OpenMP thread to avoid oversubscribing
+    the CPU. In-process tesserocr would not see the limit (its OpenMP runtime
+    was loaded when this module was imported), so workers OCR through
+    tesseract subprocesses instead.
+    """
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    if disable_tesserocr is not None:
+        disable_tesserocr()
+
+
+@functools.lru_cache(maxsize=1)
+def _worker_pdf(pdf_path: str) -> pdfplumber.PDF:
+    """
+    Open the PDF once per worker process.
+
+    The handle lives for the lifetime of the worker, which only ever serves a
+    single process_pdf() call, and is released when the pool shuts down.
+    It is opened by path: page.to_image() hands the underlying stream to
+    pypdfium2, which rejects anything but a path or a readinto()-capable file.
+    """
+    # No LAParams: text is flattened and normalized, so pdfminer's layout
+    # analysis would be wasted work.
+    return pdfplumber.open(pdf_path, laparams=None)
+
+
+@functools.lru_cache(maxsize=1)
+def _worker_fitz_doc(pdf_path: str) -> "fitz.Document":
+    """Open the PDF with PyMuPDF once per worker process."""
+    return fitz.open(pdf_path)
+
+
+def _extract_with_pdfplumber(
+    pdf_path: str,
+    page_index: int,
+    file_tag: str,
+    page_stats: Dict[str, int],
+) -> str:
+    """
+    Slow-path extraction for pages PyMuPDF could not read.
+
+    Tries pdfplumber's text extraction (plus table extraction when enabled)
+    before falling back to OCR for scanned/image-based pages.
+    """
+    pdf = _worker_pdf(pdf_path)
+    page = pdf.pages[page_index]
+    try:
+        # Preflight: a page with no characters is image-only, so skip text
+        # extraction entirely and go straight to OCR.
+        has_chars = bool(page.chars)
+        raw_text = (page.extract_text() or "") if has_chars else ""
+
+        # Debug: Log what we got from first page
+        if page_index == 0:
+            logger.debug("Page 1 text extraction (pdfplumber): %d characters", len(raw_text))
+
+        # Optional fallback: table detection is one of pdfplumber's slowest
+        # operations and rarely finds text the steps above missed.
+        if not raw_text.strip() and settings.enable_table_fallback and has_chars:
+            try:
+                table_texts = []
+                for table in page.extract_tables():
+                    for row in table:
+                        if row:
+                            table_texts.append(" ".join(str(cell) if cell else "" for cell in row))
+                raw_text = "\n".join(table_texts)
+                if page_index == 0:
+                    logger.debug("Page 1 text extraction (tables): %d characters", len(raw_text))
+            except Exception as e:
+                if page_index == 0:
+                    logger.debug("Page 1 table extraction failed: %s", e)
+
+        # Final fallback: Use OCR for scanned/image-based pages
+        if not raw_text.strip():
+            if not OCR_AVAILABLE or extract_text_with_ocr_from_pdfplumber_page is None:
+                # Reported once per document by the parent process.
+                page_stats["ocr_missing"] = 1
+            else:
+                try:
+                    logger.info(f"Attempting OCR for page {page_index + 1} (scanned/image-based)")
+                    if FITZ_AVAILABLE:
+                        # Rasterize from the worker's open PyMuPDF document;
+                        # pdfplumber's to_image() re-parses the PDF per call.
+                        ocr_text = extract_text_with_ocr_from_fitz_page(
+                            _worker_fitz_doc(pdf_path)[page_index],
+                            page_index,
+                            cache_key=file_tag,
+                        )
+                    else:
+                        ocr_text = extract_text_with_ocr_from_pdfplumber_page(
+                            pdf, page, page_index, cache_key=file_tag
+                        )
+                    if ocr_text.strip():
+                        raw_text = ocr_text
+                        page_stats["ocr_pages"] = 1
+                        logger.info(f"OCR successfully extracted {len(ocr_text)} characters from page {page_index + 1}")
+                    else:
+                        logger.warning(f"OCR returned no text for page {page_index + 1}")
+                except Exception as e:
+                    logger.error(f"OCR failed for page {page_index + 1}: {e}", exc_info=True)
+    finally:
+        # Release pdfplumber's per-page object cache so worker memory stays
+        # bounded by one page rather than growing with the document.
+        page.close()
+
+    return raw_text
+
+
+def _parse_page(
+    pdf_path: str,
+    page_index: int,
+    file_tag: str,
+    chunk_size: int,
+    chunk_overlap: int,
+) -> Tuple[List[str], List[str], List[Dict[str, object]], Dict[str, int]]:
+    """
+    Extract, normalize and chunk a single PDF page.
+
+    Runs inside a worker process, so it takes a path and page index rather
+    than pdfplumber objects (which are not picklable).
+
+    Returns parallel (ids, documents, metadatas) lists plus page_stats.
+    """
+    page_stats = {"pages": 1, "empty_pages": 0, "ocr_pages": 0, "ocr_missing": 0}
+
+    # Fast path: PyMuPDF's C text extractor handles most text-based PDFs
+    raw_text = ""
+    if FITZ_AVAILABLE:
+        raw_text = _worker_fitz_doc(pdf_path)[page_index].get_text("text") or ""
+
+        # Debug: Log what we got from first page
+        if page_index == 0:
+            logger.debug("Page 1 text extraction (pymupdf): %d characters", len(raw_text))
+
+    if not raw_text.strip():
+        raw_text = _extract_with_pdfplumber(pdf_path, page_index, file_tag, page_stats)
+
+    normalized_text = _normalize_text(raw_text)
+    if not normalized_text:
+        page_stats["empty_pages"] = 1
+        if page_index < 3:  # Log first few empty pages for debugging
+            logger.warning(
+                f"Page {page_index + 1} is empty (no extractable text even with OCR). "
+                "PDF may have quality issues or be unreadable."
+            )
+        return [], [], [], page_stats
+
+    chunks = _chunk_page_text(normalized_text, chunk_size, chunk_overlap)
+    offsets = _compute_offsets(normalized_text, chunks, chunk_overlap)
+    ids: List[str] = []
+    metadatas: List[Dict[str, object]] = []
+    source_file = Path(pdf_path).name
+    page_number = page_index + 1
+    # Metadata keys are dict-literal constants, so every chunk shares the same
+    # interned key strings; only per-page values are hoisted here.
+    id_prefix = f"{file_tag}_page_{page_number}_chunk_"
+
+    for chunk_idx, (chunk_text, (char_start, char_end)) in enumerate(
+        zip(chunks, offsets)
+    ):
+        chunk_id = f"{id_prefix}{chunk_idx}_{char_start}"
+        ids.append(chunk_id)
+        metadatas.append(
+            {
+                "source_file": source_file,
+                "page_number": page_number,
+                "chunk_id": chunk_id,
+                "char_start": char_start,
+                "char_end": char_end,
+                "chunk_sha": _chunk_sha(chunk_text),
+            }
+        )
+
+    return ids, chunks, metadatas, page_stats
+
+
+def _flush(
+    collection,
+    pending_ids: List[str],
+    pending_docs: List[str],
+    pending_meta: List[Dict[str, object]],
+    stats: Dict[str, int],
+) -> None:
+    """
+    Upsert buffered chunks into ChromaDB in one call and clear the buffers.
+
+    Chunk ids are derived from the file contents and chunk position, so
+    re-ingesting a PDF rewrites identical records and needs no lookup first.
+    Embeddings for the whole batch are computed in one encoder call.
+    """
+    if not pending_ids:
+        return
+
+    collection.upsert(
+        ids=pending_ids,
+        documents=pending_docs,
+        metadatas=pending_meta,
+        embeddings=embed_texts(pending_docs),
+    )
+    stats["chunks_added"] += len(pending_ids)
+
+    pending_ids.clear()
+    pending_docs.clear()
+    pending_meta.clear()
 
 
 def process_pdf(file_path: str | Path) -> Dict[str, int]:
     """
     Parse a PDF, chunk each page independently, and upsert into ChromaDB.
+
+    Pages are parsed in parallel by a process pool; ChromaDB writes stay on
+    the calling process and are applied in page order.
     """
-    pdf_path = Path(file_path).resolve()
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF not found: {pdf_path}")
+    pdf_path = file_path if isinstance(file_path, Path) else Path(file_path)
+    if not pdf_path.is_absolute():
+        pdf_path = pdf_path.resolve()
+    try:
+        file_tag = pdf_digest(pdf_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"PDF not found: {pdf_path}") from None
+
+    # Imported here so worker processes, which re-import this module, do not
+    # load ChromaDB.
+    from backend.vector_store.client import get_collection
 
     collection = get_collection()
-    file_tag = hashlib.sha256(str(pdf_path).encode("utf-8")).hexdigest()[:12]
     stats = {
         "pages": 0,
         "chunks_added": 0,
@@ -88,137 +394,56 @@ def process_pdf(file_path: str | Path) -> Dict[str, int]:
         "ocr_pages": 0,
     }
 
-    with pdfplumber.open(pdf_path) as pdf:
-        ocr_warning_logged = False
-        for page_index, page in enumerate(pdf.pages):
-            stats["pages"] += 1
-            # Try multiple extraction methods
-            raw_text = page.extract_text() or ""
-            
-            # Debug: Log what we got from first page
-            if page_index == 0:
-                logger.debug(f"Page 1 text extraction (normal): {len(raw_text)} characters")
-            
-            # Fallback: try extracting with layout preservation if normal extraction fails
-            if not raw_text.strip():
-                try:
-                    raw_text = page.extract_text(layout=True) or ""
-                    if page_index == 0:
-                        logger.debug(f"Page 1 text extraction (layout): {len(raw_text)} characters")
-                except Exception as e:
-                    if page_index == 0:
-                        logger.debug(f"Page 1 layout extraction failed: {e}")
-            
-            # Fallback: try extracting tables as text if still empty
-            if not raw_text.strip():
-                try:
-                    tables = page.find_tables()
-                    if tables:
-                        table_texts = []
-                        for table in page.extract_tables():
-                            for row in table:
-                                if row:
-                                    table_texts.append(" ".join(str(cell) if cell else "" for cell in row))
-                        raw_text = "\n".join(table_texts)
-                        if page_index == 0:
-                            logger.debug(f"Page 1 text extraction (tables): {len(raw_text)} characters")
-                except Exception as e:
-                    if page_index == 0:
-                        logger.debug(f"Page 1 table extraction failed: {e}")
-            
-            # Final fallback: Use OCR for scanned/image-based pages
-            if not raw_text.strip():
-                if not OCR_AVAILABLE or extract_text_with_ocr_from_pdfplumber_page is None:
-                    if not ocr_warning_logged:
-                        logger.error(
-                            "\n" + "=" * 70 + "\n"
-                            "OCR DEPENDENCIES NOT AVAILABLE!\n"
-                            "This PDF appears to be scanned (image-based).\n"
-                            "To extract text from scanned PDFs, you MUST install:\n"
-                            "\n"
-                            "1. Python packages:\n"
-                            "   pip install -r backend/requirements.txt\n"
-                            "\n"
-                            "2. Tesseract OCR (system binary):\n"
-                            "   - Windows: https://github.com/UB-Mannheim/tesseract/wiki\n"
-                            "   - macOS: brew install tesseract\n"
-                            "   - Linux: sudo apt-get install tesseract-ocr\n"
-                            "\n"
-                            "3. Poppler (for PDF to image conversion):\n"
-                            "   - Windows: https://github.com/oschwartz10612/poppler-windows/releases/\n"
-                            "   - macOS: brew install poppler\n"
-                            "   - Linux: sudo apt-get install poppler-utils\n"
-                            "\n"
-                            "Run 'python backend/check_ocr.py' to verify your setup.\n"
-                            "See OCR_SETUP.md for detailed instructions.\n"
-                            "=" * 70
-                        )
-                        ocr_warning_logged = True
-                else:
-                    try:
-                        logger.info(f"Attempting OCR for page {page_index + 1} (scanned/image-based)")
-                        ocr_text = extract_text_with_ocr_from_pdfplumber_page(pdf, page, page_index)
-                        if ocr_text.strip():
-                            raw_text = ocr_text
-                            stats["ocr_pages"] += 1
-                            logger.info(f"OCR successfully extracted {len(ocr_text)} characters from page {page_index + 1}")
-                        else:
-                            logger.warning(f"OCR returned no text for page {page_index + 1}")
-                    except Exception as e:
-                        logger.error(f"OCR failed for page {page_index + 1}: {e}", exc_info=True)
-            
-            normalized_text = _normalize_text(raw_text)
-            if not normalized_text:
-                stats["empty_pages"] += 1
-                if page_index < 3:  # Log first few empty pages for debugging
-                    logger.warning(
-                        f"Page {page_index + 1} is empty (no extractable text even with OCR). "
-                        "PDF may have quality issues or be unreadable."
-                    )
-                continue
-
-            chunks = _chunk_page_text(normalized_text)
-            search_start = 0
-            payload: List[Dict[str, object]] = []
-            ids: List[str] = []
-
-            for chunk_idx, chunk_text in enumerate(chunks):
-                char_start, char_end, search_start = _find_chunk_bounds(
-                    normalized_text, chunk_text, search_start
-                )
-                chunk_id = (
-                    f"{file_tag}_page_{page_index + 1}_chunk_{chunk_idx}_{char_start}"
-                )
-                payload.append(
-                    {
-                        "id": chunk_id,
-                        "document": chunk_text,
-                        "metadata": {
-                            "source_file": pdf_path.name,
-                            "page_number": page_index + 1,
-                            "chunk_id": chunk_id,
-                            "char_start": char_start,
-                            "char_end": char_end,
-                            "chunk_sha": _chunk_sha(chunk_text),
-                        },
-                    }
-                )
-                ids.append(chunk_id)
-
-            existing = set()
-            if ids:
-                existing_response = collection.get(ids=ids)
-                existing = set(existing_response.get("ids", []))
-
-            to_add = [item for item in payload if item["id"] not in existing]
-            if to_add:
-                collection.add(
-                    ids=[item["id"] for item in to_add],
-                    documents=[str(item["document"]) for item in to_add],
-                    metadatas=[item["metadata"] for item in to_add],
-                )
-                stats["chunks_added"] += len(to_add)
-            stats["chunks_skipped"] += len(payload) - len(to_add)
+    if FITZ_AVAILABLE:
+        with fitz.open(pdf_path) as doc:
+            page_count = doc.page_count
+    else:
+        with pdfplumber.open(pdf_path) as pdf:
+            page_count = len(pdf.pages)
+
+    workers = max(1, min(settings.ingest_workers or os.cpu_count() or 1, page_count))
+    ocr_warning_logged = False
+    pending_ids: List[str] = []
+    pending_docs: List[str] = []
+    pending_meta: List[Dict[str, object]] = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=_pool_context(),
+        initializer=_init_worker,
+        initargs=(logging.getLogger().getEffectiveLevel(),),
+    ) as executor:
+        results = executor.map(
+            _parse_page,
+            repeat(str(pdf_path), page_count),
+            range(page_count),
+            repeat(file_tag, page_count),
+            repeat(settings.chunk_size, page_count),
+            repeat(settings.chunk_overlap, page_count),
+            chunksize=4,
+        )
+        for ids, documents, metadatas, page_stats in results:
+            stats["pages"] += page_stats["pages"]
+            stats["empty_pages"] += page_stats["empty_pages"]
+            stats["ocr_pages"] += page_stats["ocr_pages"]
+
+            if page_stats["ocr_missing"] and not ocr_warning_logged:
+                logger.error(_OCR_MISSING_MSG)
+                ocr_warning_logged = True
+
+            # Identical text repeated on the same page adds nothing.
+            seen: Set[str] = set()
+            for chunk_id, document, metadata in zip(ids, documents, metadatas):
+                if metadata["chunk_sha"] in seen:
+                    stats["chunks_skipped"] += 1
+                    continue
+                seen.add(metadata["chunk_sha"])
+                pending_ids.append(chunk_id)
+                pending_docs.append(document)
+                pending_meta.append(metadata)
+            if len(pending_ids) >= _UPSERT_BATCH_SIZE:
+                _flush(collection, pending_ids, pending_docs, pending_meta, stats)
+
+    _flush(collection, pending_ids, pending_docs, pending_meta, stats)
 
     logger.info(
         "Ingested %s: pages=%d added=%d skipped=%d empty=%d ocr=%d",
@@ -244,4 +469,3 @@ def process_pdf(file_path: str | Path) -> Dict[str, int]:
     
     return stats
 
-
@@ -1,15 +1,22 @@
 """
 OCR utilities for extracting text from scanned PDF pages.
-Handles page rotation detection and OCR in all orientations.
+Handles page rotation detection via Tesseract OSD before OCR.
 """
 
 from __future__ import annotations
 
+import contextlib
 import logging
 import os
 import platform
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from backend.config import settings
+from backend.services.digest import pdf_digest
 
 logger = logging.getLogger(__name__)
 
@@ -21,10 +28,33 @@ try:
 except ImportError:
     logger.debug("pdf2image not available - will use pdfplumber's to_image() method (no Poppler needed)")
 
+# PyMuPDF is optional - when present it is the fastest way to rasterize pages
+FITZ_AVAILABLE = False
+try:
+    import fitz  # PyMuPDF
+    FITZ_AVAILABLE = True
+except ImportError:
+    logger.debug("PyMuPDF not available - pages will be rendered with pdf2image/pdfplumber")
+
+# tesserocr is optional - it drives libtesseract in-process, so OSD and OCR
+# do not each spawn a tesseract subprocess per page
+TESSEROCR_AVAILABLE = False
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    logger.debug("tesserocr not available - OCR will call tesseract through pytesseract")
+
 try:
     import pytesseract
+    import PIL
     from PIL import Image
     
+    # Pillow-SIMD is a drop-in replacement that vectorizes image operations;
+    # its versions carry a ".postN" suffix (see OCR_SETUP.md).
+    if "post" in PIL.__version__:
+        logger.info(f"Using Pillow-SIMD {PIL.__version__}")
+    
     # Auto-detect Tesseract path on Windows if not in PATH
     if platform.system() == "Windows":
         # Common Tesseract installation paths on Windows
@@ -59,57 +89,170 @@ try:
         PDF = None  # type: ignore
         Page = None  # type: ignore
     
+    _CLOCKWISE_TRANSPOSE = {
+        90: Image.Transpose.ROTATE_270,
+        180: Image.Transpose.ROTATE_180,
+        270: Image.Transpose.ROTATE_90,
+    }
+    
     OCR_AVAILABLE = True
 except ImportError as e:
     OCR_AVAILABLE = False
     logger.warning(f"OCR dependencies not available: {e}. OCR functionality will be disabled.")
 
+# Below this OSD orientation confidence, the opposite orientation is OCR'd too.
+_OSD_MIN_CONFIDENCE = 1.0
+
+# Longest side (in pixels) of the thumbnail used for orientation detection.
+_OSD_MAX_SIDE = 1200
+
+# Pages whose 128x128 grayscale thumbnail spans fewer brightness levels than
+# this are treated as blank and never reach Tesseract.
+_BLANK_THUMB_SIZE = (128, 128)
+_BLANK_MAX_RANGE = 24
+
+_OCR_CACHE_DIR = settings.cache_dir / "ocr"
+
+# Pages are OCR'd at settings.ocr_dpi (OCR_DPI, default 200); pages that yield
+# almost no text are retried once at this resolution in case of small fonts.
+_OCR_RETRY_DPI = 300
+_OCR_RETRY_MIN_CHARS = 50
+
+
+def _needs_retry(text: str, dpi: int) -> bool:
+    return dpi < _OCR_RETRY_DPI and len(text.strip()) < _OCR_RETRY_MIN_CHARS
+
+
+def _longer(text: str, other: str) -> str:
+    return other if len(other.strip()) > len(text.strip()) else text
+
+
+def _ocr_cache_path(doc_key: str, page_number: int, dpi: int) -> Path:
+    return _OCR_CACHE_DIR / f"{doc_key}_{page_number}_{dpi}.txt"
 
-def _detect_orientation(image: Image.Image) -> int:  # type: ignore
+
+def _read_ocr_cache(cache_path: Path) -> Optional[str]:
+    try:
+        return cache_path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def _write_ocr_cache(cache_path: Path, text: str, blank: bool = False) -> None:
     """
-    Detect the correct orientation of an image using Tesseract's OSD.
-    
-    Returns the rotation angle (0, 90, 180, or 270) needed to correct the orientation.
+    Store OCR text; empty results are not cached since they may be transient
+    failures, unless the page was detected as blank, which is deterministic.
     """
+    if not text.strip() and not blank:
+        return
     try:
-        # Use Tesseract's Orientation and Script Detection (OSD)
-        # This is much faster than trying all orientations
-        osd = pytesseract.image_to_osd(image, config='--psm 0')
-        
-        # Parse OSD output to get rotation angle
-        # Format: "Rotate: 90" or "Orientation in degrees: 90"
-        for line in osd.split('\n'):
-            if 'Rotate:' in line or 'Orientation in degrees:' in line:
-                try:
-                    detected_angle = int(line.split(':')[1].strip())
-                    # Tesseract reports the angle needed to rotate TO correct orientation
-                    # We need the angle to rotate FROM current orientation
-                    return detected_angle
-                except (ValueError, IndexError):
-                    continue
-    except Exception as e:
-        logger.debug(f"OSD detection failed: {e}, trying fallback method")
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent workers never read a partial file.
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug(f"Could not write OCR cache {cache_path}: {e}")
+
+
+def disable_tesserocr() -> None:
+    """
+    Route OSD and OCR in this process through pytesseract subprocesses.
+    
+    Ingestion workers cap OpenMP at one thread via OMP_THREAD_LIMIT, but
+    libgomp reads that variable once, when tesserocr is imported, which is
+    before a pool initializer can set it. Tesseract subprocesses start after
+    the initializer and do honour it.
+    """
+    global TESSEROCR_AVAILABLE
+    TESSEROCR_AVAILABLE = False
+
+
+# A PyTessBaseAPI handle must not be shared between threads, and batch OCR
+# runs pages on a thread pool, so each thread keeps its own handles.
+_tess_local = threading.local()
+
+
+def _tess_api(psm: int) -> "tesserocr.PyTessBaseAPI":
+    """Return this thread's libtesseract handle for a page segmentation mode."""
+    apis = _tess_local.__dict__.setdefault("apis", {})
+    api = apis.get(psm)
+    if api is None:
+        api = tesserocr.PyTessBaseAPI(lang="eng", psm=psm, oem=tesserocr.OEM.LSTM_ONLY)
+        apis[psm] = api
+    return api
+
+
+def _detect_orientation_tesserocr(image: Image.Image) -> Tuple[int, float]:  # type: ignore
+    api = _tess_api(tesserocr.PSM.OSD_ONLY)
+    api.SetImage(image)
+    osd = api.DetectOrientationScript()
+    if not osd:
+        return 0, 0.0
+    # orient_deg is how far the page is turned; undo it to make it upright.
+    return (360 - osd["orient_deg"]) % 360, float(osd["orient_conf"])
+
+
+def _detect_orientation(image: Image.Image) -> Tuple[int, float]:  # type: ignore
+    """
+    Detect the correct orientation of an image using Tesseract's OSD.
     
-    # Fallback: Try all orientations and pick the one with most text
-    # This is slower but more reliable if OSD fails
-    best_angle = 0
-    best_text_length = 0
+    Returns (angle, confidence): the clockwise rotation (0, 90, 180, or 270)
+    needed to correct the orientation, and OSD's orientation confidence
+    (0.0 when OSD could not decide).
+    """
+    # OSD only needs coarse layout, so run it on a downscaled copy; the
+    # full-resolution image is kept for the actual OCR pass.
+    scale = min(1.0, _OSD_MAX_SIDE / max(image.size))
+    if scale < 1.0:
+        width, height = image.size
+        image = image.resize(
+            (int(width * scale), int(height * scale)), Image.Resampling.BILINEAR
+        )
     
-    for angle in [0, 90, 180, 270]:
-        rotated = image.rotate(-angle, expand=True)
+    if TESSEROCR_AVAILABLE:
         try:
-            # Quick OCR test with minimal config
-            text = pytesseract.image_to_string(rotated, lang="eng", config='--psm 6')
-            text_length = len(text.strip())
-            
-            if text_length > best_text_length:
-                best_text_length = text_length
-                best_angle = angle
+            return _detect_orientation_tesserocr(image)
         except Exception as e:
-            logger.debug(f"OCR test failed for angle {angle}: {e}")
-            continue
+            logger.debug(f"OSD detection failed: {e}")
+            return 0, 0.0
     
-    return best_angle
+    try:
+        # Use Tesseract's Orientation and Script Detection (OSD);
+        # "rotate" is the clockwise rotation that makes the page upright.
+        osd = pytesseract.image_to_osd(
+            image, config='--psm 0', output_type=pytesseract.Output.DICT
+        )
+        return osd["rotate"], osd["orientation_conf"]
+    except Exception as e:
+        logger.debug(f"OSD detection failed: {e}")
+        return 0, 0.0
+
+
+def _fast_rotate(image: Image.Image, angle: int) -> Image.Image:  # type: ignore
+    """
+    Rotate clockwise by a multiple of 90 degrees.
+    
+    Same result as image.rotate(-angle, expand=True), but transpose is a plain
+    pixel copy instead of a trip through the affine resampler.
+    """
+    angle %= 360
+    if angle == 0:
+        return image
+    # Transpose.ROTATE_* turn counter-clockwise
+    return image.transpose(_CLOCKWISE_TRANSPOSE[angle])
+
+
+def _is_blank(image: Image.Image) -> bool:  # type: ignore
+    """
+    Cheap check for blank separator pages.
+    
+    BOX downscaling averages each block of the page, so scanner specks fade
+    while even a single word still darkens its block well past the threshold.
+    """
+    thumb = image.convert("L").resize(_BLANK_THUMB_SIZE, Image.Resampling.BOX)
+    lo, hi = thumb.getextrema()
+    return hi - lo < _BLANK_MAX_RANGE
 
 
 def _ocr_image(image: Image.Image, rotation: int = 0) -> str:  # type: ignore
@@ -123,12 +266,17 @@ def _ocr_image(image: Image.Image, rotation: int = 0) -> str:  # type: ignore
     Returns:
         Extracted text string
     """
-    if rotation != 0:
-        image = image.rotate(-rotation, expand=True)
+    image = _fast_rotate(image, rotation)
     
     try:
+        if TESSEROCR_AVAILABLE:
+            # Same settings as the pytesseract path: LSTM only, uniform block
+            api = _tess_api(tesserocr.PSM.SINGLE_BLOCK)
+            api.SetImage(image)
+            return api.GetUTF8Text()
+        
         # Use Tesseract with optimized settings for scanned documents
-        custom_config = r'--oem 3 --psm 6'  # OEM 3 = LSTM, PSM 6 = Assume uniform block of text
+        custom_config = r'--oem 1 --psm 6'  # OEM 1 = LSTM only, PSM 6 = Assume uniform block of text
         text = pytesseract.image_to_string(image, lang="eng", config=custom_config)
         return text
     except Exception as e:
@@ -146,25 +294,37 @@ def extract_text_with_ocr_from_image(image: Image.Image) -> str:  # type: ignore
     Returns:
         Extracted text string
     """
+    return _ocr_page_image(image) or ""
+
+
+def _ocr_page_image(image: Image.Image) -> Optional[str]:  # type: ignore
+    """
+    OCR a rendered page, returning None when it is blank.
+    
+    Blank pages never reach Tesseract, and telling them apart from pages that
+    merely yielded little text lets callers skip the high-DPI retry.
+    """
     try:
+        if _is_blank(image):
+            logger.debug("Skipping OCR for blank page")
+            return None
+        
         # Detect best orientation
-        best_angle = _detect_orientation(image)
+        best_angle, confidence = _detect_orientation(image)
         if best_angle != 0:
             logger.debug(f"Detected page rotation: {best_angle} degrees")
         
         # Perform OCR with correct orientation
         text = _ocr_image(image, rotation=best_angle)
         
-        # If text is still empty, try all orientations
-        if not text.strip():
-            logger.debug("Trying all orientations as fallback")
-            for angle in [0, 90, 180, 270]:
-                if angle == best_angle:
-                    continue  # Already tried
-                text = _ocr_image(image, rotation=angle)
-                if text.strip():
-                    logger.debug(f"Found text at {angle} degrees")
-                    break
+        # OSD is unsure: the likely mistake is an upside-down page, so try the
+        # opposite orientation and keep whichever read yields more text.
+        if confidence < _OSD_MIN_CONFIDENCE:
+            flipped_angle = (best_angle + 180) % 360
+            flipped = _ocr_image(image, rotation=flipped_angle)
+            if len(flipped.strip()) > len(text.strip()):
+                logger.debug(f"Found more text at {flipped_angle} degrees")
+                text = flipped
         
         return text
     except Exception as e:
@@ -172,19 +332,88 @@ def extract_text_with_ocr_from_image(image: Image.Image) -> str:  # type: ignore
         return ""
 
 
+def _ocr_with_retry(ocr_at: Callable[[int], Optional[str]], dpi: int) -> Tuple[str, bool]:
+    """
+    Run ocr_at(dpi), retrying near-empty pages once at _OCR_RETRY_DPI.
+    
+    Returns (text, blank); blank pages are not retried.
+    """
+    text = ocr_at(dpi)
+    if text is None:
+        return "", True
+    if _needs_retry(text, dpi):
+        text = _longer(text, ocr_at(_OCR_RETRY_DPI) or "")
+    return text, False
+
+
+def _render_fitz_page(page: "fitz.Page", dpi: int) -> Image.Image:  # type: ignore
+    """Rasterize a PyMuPDF page to an RGB PIL image."""
+    zoom = dpi / 72
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+
+def _render_page_fitz(pdf_path: str, page_number: int, dpi: int) -> Optional[Image.Image]:  # type: ignore
+    """Render a single 1-indexed page with PyMuPDF without loading the rest of the PDF."""
+    with fitz.open(pdf_path) as doc:
+        if not 1 <= page_number <= doc.page_count:
+            return None
+        return _render_fitz_page(doc[page_number - 1], dpi)
+
+
+@contextlib.contextmanager
+def _page_renderer(pdf_path: str) -> Iterator[Callable[[int, int], Optional[Image.Image]]]:  # type: ignore
+    """
+    Open the PDF once and yield a render(page_number, dpi) function.
+    
+    Uses PyMuPDF when available, otherwise pdfplumber. Out-of-range pages
+    render as None.
+    """
+    if FITZ_AVAILABLE:
+        with fitz.open(pdf_path) as doc:
+            def render_fitz(page_number: int, dpi: int) -> Optional[Image.Image]:  # type: ignore
+                if not 1 <= page_number <= doc.page_count:
+                    return None
+                return _render_fitz_page(doc[page_number - 1], dpi)
+            
+            yield render_fitz
+        return
+    
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        def render_pdfplumber(page_number: int, dpi: int) -> Optional[Image.Image]:  # type: ignore
+            if not 1 <= page_number <= len(pdf.pages):
+                return None
+            page = pdf.pages[page_number - 1]
+            try:
+                return page.to_image(resolution=dpi).original
+            finally:
+                page.close()
+        
+        yield render_pdfplumber
+
+
 def extract_text_with_ocr_from_pdf_page(
     pdf_path: str,
     page_number: int,
-    dpi: int = 300,
+    dpi: int = settings.ocr_dpi,
+    force_refresh: bool = False,
 ) -> str:
     """
     Extract text from a specific PDF page using OCR.
-    Uses pdf2image if available (requires Poppler), otherwise falls back to pdfplumber.
+    Renders with PyMuPDF if available, then pdf2image (requires Poppler),
+    otherwise falls back to pdfplumber.
+    Results are cached on disk by PDF content, page and DPI.
+    
+    Each call opens the PDF again; to OCR several pages, use
+    extract_text_with_ocr_from_pdf_batch, which opens it once.
     
     Args:
         pdf_path: Path to PDF file (must be a file path, not bytes)
         page_number: 1-indexed page number
-        dpi: Resolution for image conversion (higher = better quality but slower)
+        dpi: Resolution for image conversion (higher = better quality but slower).
+            Pages with almost no text are retried once at 300 DPI.
+        force_refresh: Ignore any cached result and OCR the page again
     
     Returns:
         Extracted text string
@@ -193,7 +422,36 @@ def extract_text_with_ocr_from_pdf_page(
         logger.error("OCR dependencies not available. Please install pytesseract and Pillow.")
         return ""
     
-    # Try pdf2image first if available (requires Poppler)
+    try:
+        cache_path = _ocr_cache_path(pdf_digest(pdf_path), page_number, dpi)
+    except OSError as e:
+        logger.error(f"Failed to read PDF {pdf_path}: {e}")
+        return ""
+    if not force_refresh:
+        cached = _read_ocr_cache(cache_path)
+        if cached is not None:
+            return cached
+    
+    text, blank = _ocr_with_retry(
+        lambda page_dpi: _ocr_pdf_page(pdf_path, page_number, page_dpi), dpi
+    )
+    _write_ocr_cache(cache_path, text, blank=blank)
+    return text
+
+
+def _ocr_pdf_page(pdf_path: str, page_number: int, dpi: int) -> Optional[str]:
+    """Render a PDF page and OCR it, bypassing the cache (None if blank)."""
+    # Prefer PyMuPDF: its C renderer reads only the requested page
+    if FITZ_AVAILABLE:
+        try:
+            image = _render_page_fitz(pdf_path, page_number, dpi)
+            if image is None:
+                return ""
+            return _ocr_page_image(image)
+        except Exception as e:
+            logger.debug(f"PyMuPDF rendering failed: {e}")
+    
+    # Try pdf2image if available (requires Poppler)
     if PDF2IMAGE_AVAILABLE:
         try:
             images = convert_from_path(
@@ -205,7 +463,7 @@ def extract_text_with_ocr_from_pdf_page(
             
             if images:
                 image = images[0]
-                return extract_text_with_ocr_from_image(image)
+                return _ocr_page_image(image)
         except Exception as e:
             logger.debug(f"pdf2image conversion failed (Poppler may be missing): {e}")
     
@@ -217,7 +475,7 @@ def extract_text_with_ocr_from_pdf_page(
                 page = pdf.pages[page_number - 1]
                 im = page.to_image(resolution=dpi)
                 pil_image = im.original
-                return extract_text_with_ocr_from_image(pil_image)
+                return _ocr_page_image(pil_image)
     except Exception as e:
         logger.error(f"Failed to extract text from PDF page {page_number}: {e}")
         return ""
@@ -225,21 +483,216 @@ def extract_text_with_ocr_from_pdf_page(
     return ""
 
 
+def _render_or_none(
+    render: Callable[[int, int], Optional[Image.Image]],  # type: ignore
+    pdf_path: str,
+    page_number: int,
+    dpi: int,
+) -> Optional[Image.Image]:  # type: ignore
+    """Render one page, logging a failure instead of aborting the whole batch."""
+    try:
+        return render(page_number, dpi)
+    except Exception as e:
+        logger.error(f"Failed to render page {page_number} of {pdf_path} at {dpi} DPI: {e}")
+        return None
+
+
+def _submit_bounded(
+    executor: ThreadPoolExecutor,
+    slots: threading.BoundedSemaphore,
+    image: Image.Image,  # type: ignore
+) -> Future:
+    """Queue an OCR job once a slot is free; the slot is released when it finishes."""
+    slots.acquire()
+    future = executor.submit(_ocr_page_image, image)
+    future.add_done_callback(lambda _: slots.release())
+    return future
+
+
+def extract_text_with_ocr_from_pdf_batch(
+    pdf_path: str,
+    page_numbers: List[int],
+    dpi: int = settings.ocr_dpi,
+    max_workers: int = 4,
+    force_refresh: bool = False,
+) -> Dict[int, str]:
+    """
+    Extract text from several PDF pages using OCR, in parallel.
+    
+    The PDF is opened once, for both the first pass and the high-DPI retry
+    (retries are rendered as soon as a page's first result is in, between
+    first-pass renders), and pages are rendered one at a time (neither PyMuPDF nor pdfplumber is
+    thread-safe); each rendered image is handed to a thread pool right
+    away. Tesseract runs outside the GIL, so worker threads overlap OCR.
+    At most 2 x max_workers rendered pages are queued or in progress at a
+    time, so memory does not grow with the page count.
+    
+    Args:
+        pdf_path: Path to PDF file
+        page_numbers: 1-indexed page numbers to OCR
+        dpi: Resolution for image conversion (near-empty pages retry at 300 DPI)
+        max_workers: Upper bound on concurrent Tesseract processes
+        force_refresh: Ignore cached results and OCR every page again
+    
+    Returns:
+        Mapping of page number to extracted text ("" for failed pages)
+    """
+    if not OCR_AVAILABLE:
+        logger.error("OCR dependencies not available. Please install pytesseract and Pillow.")
+        return {page_number: "" for page_number in page_numbers}
+    
+    results: Dict[int, str] = {}
+    try:
+        doc_key = pdf_digest(pdf_path)
+    except OSError as e:
+        logger.error(f"Failed to read PDF {pdf_path}: {e}")
+        return {page_number: "" for page_number in page_numbers}
+    if not force_refresh:
+        for page_number in page_numbers:
+            cached = _read_ocr_cache(_ocr_cache_path(doc_key, page_number, dpi))
+            if cached is not None:
+                results[page_number] = cached
+    
+    workers = max(1, min(os.cpu_count() or 1, max_workers))
+    pending = [n for n in page_numbers if n not in results]
+    futures: Dict[int, Future] = {}
+    retry_futures: Dict[int, Future] = {}
+    # Each queued job holds a full-resolution page image.
+    slots = threading.BoundedSemaphore(2 * workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            # One open PDF serves both the first pass and the high-DPI retry
+            with _page_renderer(pdf_path) as render:
+                
+                def queue_retry(page_number: int) -> None:
+                    """Retry a near-empty page once at a higher resolution."""
+                    text = futures[page_number].result()
+                    if text is None or not _needs_retry(text, dpi):
+                        return
+                    pil_image = _render_or_none(render, pdf_path, page_number, _OCR_RETRY_DPI)
+                    if pil_image is not None:
+                        retry_futures[page_number] = _submit_bounded(executor, slots, pil_image)
+                
+                awaiting: Deque[int] = deque()
+                for page_number in pending:
+                    pil_image = _render_or_none(render, pdf_path, page_number, dpi)
+                    if pil_image is None:
+                        results[page_number] = ""
+                        continue
+                    futures[page_number] = _submit_bounded(executor, slots, pil_image)
+                    awaiting.append(page_number)
+                    # Interleave retries with the first pass as results arrive
+                    while awaiting and futures[awaiting[0]].done():
+                        queue_retry(awaiting.popleft())
+                
+                while awaiting:
+                    queue_retry(awaiting.popleft())
+        except Exception as e:
+            logger.error(f"Failed to open {pdf_path} for rendering: {e}")
+        
+        for page_number, future in futures.items():
+            results[page_number] = future.result() or ""
+        for page_number, future in retry_futures.items():
+            results[page_number] = _longer(results[page_number], future.result() or "")
+        
+        for page_number, future in futures.items():
+            _write_ocr_cache(
+                _ocr_cache_path(doc_key, page_number, dpi),
+                results[page_number],
+                blank=future.result() is None,
+            )
+    
+    for page_number in page_numbers:
+        results.setdefault(page_number, "")
+    return results
+
+
+def _ocr_rendered_page(
+    render: Callable[[int], Image.Image],  # type: ignore
+    page_number: int,
+    dpi: int,
+    cache_key: Optional[str],
+    force_refresh: bool,
+) -> str:
+    """
+    OCR one already-open page through the cache, with the high-DPI retry.
+    
+    render(dpi) rasterizes the page; it is only called on a cache miss.
+    """
+    cache_path = _ocr_cache_path(cache_key, page_number, dpi) if cache_key else None
+    if cache_path is not None and not force_refresh:
+        cached = _read_ocr_cache(cache_path)
+        if cached is not None:
+            return cached
+    
+    try:
+        text, blank = _ocr_with_retry(
+            lambda page_dpi: _ocr_page_image(render(page_dpi)), dpi
+        )
+    except Exception as e:
+        logger.error(f"OCR extraction from page {page_number} failed: {e}")
+        return ""
+    
+    if cache_path is not None:
+        _write_ocr_cache(cache_path, text, blank=blank)
+    return text
+
+
+def extract_text_with_ocr_from_fitz_page(
+    page: "fitz.Page",  # type: ignore
+    page_index: int,
+    dpi: int = settings.ocr_dpi,
+    cache_key: Optional[str] = None,
+    force_refresh: bool = False,
+) -> str:
+    """
+    Extract text from a PyMuPDF Page object using OCR.
+    Renders from the caller's open document, so nothing is re-parsed.
+    
+    Args:
+        page: PyMuPDF Page object
+        page_index: 0-indexed page number
+        dpi: Resolution for image conversion (near-empty pages retry at 300 DPI)
+        cache_key: Content hash of the PDF; enables the on-disk OCR cache
+        force_refresh: Ignore any cached result and OCR the page again
+    
+    Returns:
+        Extracted text string
+    """
+    if not OCR_AVAILABLE:
+        logger.error("OCR dependencies not available. Please install pytesseract and Pillow.")
+        return ""
+    
+    return _ocr_rendered_page(
+        lambda page_dpi: _render_fitz_page(page, page_dpi),
+        page_index + 1,
+        dpi,
+        cache_key,
+        force_refresh,
+    )
+
+
 def extract_text_with_ocr_from_pdfplumber_page(
     pdf: PDF,  # type: ignore
     page: Page,  # type: ignore
     page_index: int,
-    dpi: int = 300,
+    dpi: int = settings.ocr_dpi,
+    cache_key: Optional[str] = None,
+    force_refresh: bool = False,
 ) -> str:
     """
     Extract text from a pdfplumber Page object using OCR.
-    Uses pdfplumber's to_image() method (no Poppler required).
+    Uses pdfplumber's to_image() method (no Poppler required), which
+    re-opens the PDF with pypdfium2 on every render; prefer
+    extract_text_with_ocr_from_fitz_page when PyMuPDF is installed.
     
     Args:
         pdf: pdfplumber PDF object
         page: pdfplumber Page object
         page_index: 0-indexed page number
-        dpi: Resolution for image conversion
+        dpi: Resolution for image conversion (near-empty pages retry at 300 DPI)
+        cache_key: Content hash of the PDF; enables the on-disk OCR cache
+        force_refresh: Ignore any cached result and OCR the page again
     
     Returns:
         Extracted text string
@@ -248,12 +701,11 @@ def extract_text_with_ocr_from_pdfplumber_page(
         logger.error("OCR dependencies not available. Please install pytesseract and Pillow.")
         return ""
     
-    try:
-        # Use pdfplumber's to_image() method - no Poppler needed!
-        im = page.to_image(resolution=dpi)
-        pil_image = im.original
-        return extract_text_with_ocr_from_image(pil_image)
-    except Exception as e:
-        logger.error(f"OCR extraction from pdfplumber page {page_index + 1} failed: {e}")
-        return ""
-
+    # Use pdfplumber's to_image() method - no Poppler needed!
+    return _ocr_rendered_page(
+        lambda page_dpi: page.to_image(resolution=page_dpi).original,
+        page_index + 1,
+        dpi,
+        cache_key,
+        force_refresh,
+    )
@@ -5,17 +5,33 @@ Query and response utilities for Precision RAG.
 from __future__ import annotations
 
 import logging
-import re
-from typing import Dict, List, Tuple
+import threading
+from typing import Dict, Iterator, List, Tuple
 
 import google.generativeai as genai
 
 from backend.config import settings
+from backend.services.embeddings import embed_queries
 from backend.vector_store.client import get_collection
 
 
 logger = logging.getLogger(__name__)
-CITATION_PATTERN = re.compile(r"\[Ref:\s*Page\s*(\d+)\]")
+_REF_OPEN = "[Ref:"
+NO_ANSWER_TEXT = "I cannot find this information in the provided documents."
+
+_SYSTEM_PROMPT = (
+    "You are a precision-focused technical auditor. Your goal is to answer "
+    "questions based ONLY on the provided context snippets.\n\n"
+    "INPUT CONTEXT FORMAT:\n"
+    "[Source: {filename}, Page: {page_number}] {content}\n\n"
+    "INSTRUCTIONS:\n"
+    "1. Strict Grounding: Do not use outside knowledge. If the answer is "
+    'not in the context, state "I cannot find this information in the provided documents."\n'
+    "2. Citation Requirement: Every single claim or factual statement must "
+    "be immediately followed by a citation reference in the format [Ref: Page X].\n"
+    "3. Synthesis: If multiple pages contain the answer, combine them and cite both.\n"
+    "4. Tone: Professional, objective, and concise.\n"
+)
 
 
 def _configure_gemini() -> genai.GenerativeModel:
@@ -25,6 +41,7 @@ def _configure_gemini() -> genai.GenerativeModel:
     genai.configure(api_key=settings.gemini_api_key)
     return genai.GenerativeModel(
         model_name="gemini-2.5-flash",
+        system_instruction=_SYSTEM_PROMPT,
         generation_config={
             "temperature": 0.0,
             "top_k": 1,
@@ -40,33 +57,79 @@ def _configure_gemini() -> genai.GenerativeModel:
 
 
 _gemini_model: genai.GenerativeModel | None = None
+_gemini_model_lock = threading.Lock()
 
 
 def _get_model() -> genai.GenerativeModel:
+    """Return the shared Gemini model, configuring it on first use."""
     global _gemini_model
     if _gemini_model is None:
-        _gemini_model = _configure_gemini()
+        # Requests arrive on the thread pool; only one may configure.
+        with _gemini_model_lock:
+            if _gemini_model is None:
+                _gemini_model = _configure_gemini()
     return _gemini_model
 
 
 def retrieve_chunks(query: str, limit: int = 15, max_chars: int = 12000) -> List[Dict]:
     """Fetch the most relevant chunks from Chroma."""
+    batches = retrieve_chunks_batch([query], limit=limit, max_chars=max_chars)
+    return batches[0] if batches else []
+
+
+def retrieve_chunks_batch(
+    queries: List[str],
+    limit: int = 15,
+    max_chars: int = 12000,
+) -> List[List[Dict]]:
+    """
+    Fetch the most relevant chunks for several queries with one Chroma call.
+
+    Returns one chunk list per query, in the same order as `queries`.
+    """
     collection = get_collection()
     results = collection.query(
-        query_texts=[query],
+        query_embeddings=embed_queries(queries),
         n_results=limit,
     )
 
-    documents = results.get("documents", [[]])[0]
-    metadatas = results.get("metadatas", [[]])[0]
-    ids = results.get("ids", [[]])[0]
-    distances = results.get("distances", [[]])[0]
+    empty = [[] for _ in queries]
+    return [
+        _select_chunks(documents, metadatas, ids, distances, max_chars)
+        for documents, metadatas, ids, distances in zip(
+            results.get("documents") or empty,
+            results.get("metadatas") or empty,
+            results.get("ids") or empty,
+            results.get("distances") or empty,
+            strict=False,
+        )
+    ]
+
 
-    combined: List[Dict] = []
-    for doc, metadata, chunk_id, distance in zip(
-        documents, metadatas, ids, distances, strict=False
+def _select_chunks(
+    documents: List[str],
+    metadatas: List[Dict],
+    ids: List[str],
+    distances: List[float],
+    max_chars: int,
+) -> List[Dict]:
+    """
+    Pack the closest results into the character budget.
+
+    Chunks are taken in order of distance; one that would overflow the
+    budget is skipped rather than ending the selection, so a long chunk
+    cannot crowd out shorter, still-relevant ones behind it.
+    """
+    selected: List[Dict] = []
+    remaining = max_chars
+    for doc, metadata, chunk_id, distance in sorted(
+        zip(documents, metadatas, ids, distances, strict=False),
+        key=lambda row: row[3],
     ):
-        combined.append(
+        if len(doc) > remaining:
+            continue
+        remaining -= len(doc)
+        selected.append(
             {
                 "id": chunk_id,
                 "document": doc,
@@ -74,48 +137,27 @@ def retrieve_chunks(query: str, limit: int = 15, max_chars: int = 12000) -> List
                 "distance": distance,
             }
         )
-
-    total_chars = 0
-    filtered: List[Dict] = []
-    for chunk in combined:
-        doc_len = len(chunk["document"])
-        if total_chars + doc_len > max_chars:
-            break
-        filtered.append(chunk)
-        total_chars += doc_len
-
-    return filtered
+    return selected
 
 
 def build_context(chunks: List[Dict]) -> str:
     """Format retrieved chunks for the Gemini prompt."""
-    formatted = []
-    for chunk in chunks:
-        metadata = chunk["metadata"]
-        formatted.append(
-            f"[Source: {metadata['source_file']}, Page: {metadata['page_number']}] "
-            f"{chunk['document']}"
-        )
-    return "\n".join(formatted)
+    return "\n".join(
+        [
+            f"[Source: {meta['source_file']}, Page: {meta['page_number']}] {doc}"
+            for doc, meta in ((c["document"], c["metadata"]) for c in chunks)
+        ]
+    )
 
 
 def build_prompt(user_query: str, context: str) -> str:
-    """Construct the final prompt, embedding the system instructions."""
-    system_prompt = (
-        "You are a precision-focused technical auditor. Your goal is to answer "
-        "questions based ONLY on the provided context snippets.\n\n"
-        "INPUT CONTEXT FORMAT:\n"
-        "[Source: {filename}, Page: {page_number}] {content}\n\n"
-        "INSTRUCTIONS:\n"
-        "1. Strict Grounding: Do not use outside knowledge. If the answer is "
-        'not in the context, state "I cannot find this information in the provided documents."\n'
-        "2. Citation Requirement: Every single claim or factual statement must "
-        "be immediately followed by a citation reference in the format [Ref: Page X].\n"
-        "3. Synthesis: If multiple pages contain the answer, combine them and cite both.\n"
-        "4. Tone: Professional, objective, and concise.\n"
-    )
+    """
+    Construct the per-request prompt.
+
+    The static system instructions are attached to the model once (see
+    _configure_gemini), so only the question and context are sent here.
+    """
     return (
-        f"{system_prompt}\n"
         f"USER QUESTION: {user_query}\n\n"
         f"CONTEXT:\n{context}"
     )
@@ -130,20 +172,63 @@ def call_gemini(prompt: str) -> str:
     return response.text.strip()
 
 
+def call_gemini_stream(prompt: str) -> Iterator[str]:
+    """Invoke Gemini with streaming, yielding answer text as it is generated."""
+    model = _get_model()
+    for chunk in model.generate_content(prompt, stream=True):
+        try:
+            text = chunk.text
+        except ValueError:
+            # Chunk carried no text parts (e.g. only finish metadata).
+            continue
+        if text:
+            yield text
+
+
+def _find_refs(answer: str) -> List[int]:
+    r"""
+    Return the page number of every `[Ref: Page X]` marker, in order.
+
+    A str.find scan that accepts exactly what `\[Ref:\s*Page\s*(\d+)\]`
+    does, without a trip through the regex engine for each answer.
+    """
+    pages: List[int] = []
+    n = len(answer)
+    i = answer.find(_REF_OPEN)
+    while i != -1:
+        j = i + len(_REF_OPEN)
+        while j < n and answer[j].isspace():
+            j += 1
+        if answer.startswith("Page", j):
+            j += 4
+            while j < n and answer[j].isspace():
+                j += 1
+            start = j
+            while j < n and answer[j].isdecimal():
+                j += 1
+            if j > start and j < n and answer[j] == "]":
+                pages.append(int(answer[start:j]))
+                i = answer.find(_REF_OPEN, j + 1)
+                continue
+        i = answer.find(_REF_OPEN, i + 1)
+    return pages
+
+
 def build_citations(answer: str, chunks: List[Dict]) -> List[Dict]:
     """Map `[Ref: Page X]` markers to actual chunk metadata."""
     citations: List[Dict] = []
-    page_to_chunk: Dict[int, Dict] = {}
-    for chunk in chunks:
-        page_to_chunk.setdefault(chunk["metadata"]["page_number"], chunk)
+    # Built from the end so the first chunk seen for each page wins.
+    page_to_chunk: Dict[int, Dict] = {
+        chunk["metadata"]["page_number"]: chunk for chunk in reversed(chunks)
+    }
 
-    for idx, match in enumerate(CITATION_PATTERN.finditer(answer), start=1):
-        page_num = int(match.group(1))
-        chunk = page_to_chunk.get(page_num)
+    for idx, page in enumerate(_find_refs(answer), start=1):
+        chunk = page_to_chunk.get(page)
         if not chunk:
             continue
         metadata = chunk["metadata"]
-        snippet = chunk["document"][:250] + ("..." if len(chunk["document"]) > 250 else "")
+        doc = chunk["document"]
+        snippet = doc[:250] + ("..." if len(doc) > 250 else "")
         citations.append(
             {
                 "id": idx,
@@ -175,11 +260,7 @@ def execute_query(user_query: str) -> Tuple[str, List[Dict], List[Dict]]:
     """
     chunks = retrieve_chunks(user_query)
     if not chunks:
-        return (
-            "I cannot find this information in the provided documents.",
-            [],
-            [],
-        )
+        return (NO_ANSWER_TEXT, [], [])
 
     context = build_context(chunks)
     prompt = build_prompt(user_query, context)
@@ -187,3 +268,28 @@ def execute_query(user_query: str) -> Tuple[str, List[Dict], List[Dict]]:
     citations = build_citations(answer, chunks)
     return answer, citations, chunks
 
+
+def execute_query_stream(user_query: str) -> Iterator[Tuple[str, object]]:
+    """
+    Streaming variant of execute_query.
+
+    Yields ("delta", text) events while the answer is generated, then one
+    ("citations", citations) event resolved against the complete answer.
+    """
+    chunks = retrieve_chunks(user_query)
+    if not chunks:
+        yield "delta", NO_ANSWER_TEXT
+        yield "citations", []
+        return
+
+    context = build_context(chunks)
+    prompt = build_prompt(user_query, context)
+    parts: List[str] = []
+    for text in call_gemini_stream(prompt):
+        parts.append(text)
+        yield "delta", text
+
+    answer = "".join(parts).strip()
+    if not answer:
+        raise RuntimeError("No text returned from Gemini.")
+    yield "citations", build_citations(answer, chunks)
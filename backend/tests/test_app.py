@@ -0,0 +1,7 @@
+from backend import app as app_module
+
+
+def test_sse_encodes_event_and_json_payload():
+    assert app_module._sse("delta", {"text": "M35"}) == (
+        b'event: delta\ndata: {"text":"M35"}\n\n'
+    )
@@ -1,3 +1,5 @@
+import pytest
+
 from backend.services import ingest
 
 
@@ -11,3 +13,50 @@ def test_chunk_sha_is_deterministic():
     assert ingest._chunk_sha(text) == ingest._chunk_sha(text)
 
 
+def test_compute_offsets_tracks_overlapping_chunks():
+    page_text = "alpha beta gamma delta"
+    chunks = ["alpha beta", "beta gamma", "gamma delta"]
+    offsets = ingest._compute_offsets(page_text, chunks, chunk_overlap=5)
+    assert [page_text[start:end] for start, end in offsets] == chunks
+
+
+@pytest.mark.parametrize("use_fitz", [True, False])
+def test_extract_with_pdfplumber_ocrs_image_only_page(tmp_path, monkeypatch, use_fitz):
+    from PIL import Image, ImageDraw
+
+    from backend.services import ocr
+
+    pdf_path = tmp_path / "scan.pdf"
+    scan = Image.new("RGB", (200, 300), "white")
+    ImageDraw.Draw(scan).rectangle((20, 20, 180, 60), fill="black")
+    scan.save(pdf_path)
+    ocr_text = "Clear cover to reinforcement shall be 50mm in all footings."
+    monkeypatch.setattr(ocr, "_OCR_CACHE_DIR", tmp_path / "ocr")
+    monkeypatch.setattr(ocr, "_ocr_page_image", lambda image: ocr_text)
+    if use_fitz:
+        pytest.importorskip("fitz")
+        # The PyMuPDF path must not fall back to pdfplumber's renderer.
+        monkeypatch.setattr(
+            ingest.pdfplumber.page.Page, "to_image", lambda *args, **kwargs: 1 / 0
+        )
+    monkeypatch.setattr(ingest, "FITZ_AVAILABLE", use_fitz)
+
+    page_stats = {"pages": 1, "empty_pages": 0, "ocr_pages": 0, "ocr_missing": 0}
+    try:
+        text = ingest._extract_with_pdfplumber(str(pdf_path), 0, "tag", page_stats)
+    finally:
+        ingest._worker_pdf.cache_clear()
+        ingest._worker_fitz_doc.cache_clear()
+    assert text == ocr_text
+    assert page_stats["ocr_pages"] == 1
+
+
+def test_pdf_digest_tracks_file_contents(tmp_path):
+    from backend.services.digest import pdf_digest
+
+    pdf_path = tmp_path / "spec.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 first")
+    first = pdf_digest(pdf_path)
+    assert first == pdf_digest(str(pdf_path))
+    pdf_path.write_bytes(b"%PDF-1.4 second revision")
+    assert pdf_digest(pdf_path) != first
@@ -0,0 +1,135 @@
+import random
+
+import pytest
+
+from backend.services import ocr
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+ImageFont = pytest.importorskip("PIL.ImageFont")
+
+# A Letter page rendered at 200 DPI.
+PAGE_SIZE = (1700, 2200)
+
+
+def test_is_blank_accepts_white_page():
+    assert ocr._is_blank(Image.new("RGB", PAGE_SIZE, "white"))
+
+
+def test_is_blank_accepts_speckled_scan():
+    rng = random.Random(0)
+    page = Image.new("L", PAGE_SIZE, 240)
+    draw = ImageDraw.Draw(page)
+    for _ in range(3000):
+        draw.point((rng.randrange(PAGE_SIZE[0]), rng.randrange(PAGE_SIZE[1])), fill=0)
+    assert ocr._is_blank(page)
+
+
+def test_is_blank_rejects_single_text_line():
+    page = Image.new("RGB", PAGE_SIZE, "white")
+    ImageDraw.Draw(page).text(
+        (200, 1000),
+        "Clear cover shall be 50mm.",
+        fill="black",
+        font=ImageFont.load_default(size=22),
+    )
+    assert not ocr._is_blank(page)
+
+
+def test_blank_page_is_not_retried_at_high_dpi(tmp_path, monkeypatch):
+    monkeypatch.setattr(ocr, "_OCR_CACHE_DIR", tmp_path)
+    rendered = []
+
+    def render(dpi):
+        rendered.append(dpi)
+        return Image.new("RGB", (170, 220), "white")
+
+    assert ocr._ocr_rendered_page(render, 1, 200, "tag", False) == ""
+    assert ocr._ocr_rendered_page(render, 1, 200, "tag", False) == ""
+    # Rendered once at the base DPI; the second call is served from the cache.
+    assert rendered == [200]
+
+
+def _stub_batch(monkeypatch, tmp_path, render):
+    import contextlib
+
+    @contextlib.contextmanager
+    def page_renderer(pdf_path):
+        yield render
+
+    monkeypatch.setattr(ocr, "_OCR_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(ocr, "pdf_digest", lambda pdf_path: "tag")
+    monkeypatch.setattr(ocr, "_page_renderer", page_renderer)
+    # The stub renderer returns (page, dpi) tuples in place of images; the
+    # "OCR" reads more text at higher DPI, but always under the retry limit.
+    monkeypatch.setattr(
+        ocr, "_ocr_page_image", lambda image: f"p{image[0]} " + "x" * (image[1] // 10)
+    )
+
+
+def test_pdf_batch_survives_render_failure_and_retries_short_pages(tmp_path, monkeypatch):
+    rendered = []
+
+    def render(page_number, dpi):
+        rendered.append((page_number, dpi))
+        if page_number == 2:
+            raise RuntimeError("corrupt page")
+        return page_number, dpi
+
+    _stub_batch(monkeypatch, tmp_path, render)
+    results = ocr.extract_text_with_ocr_from_pdf_batch("doc.pdf", [1, 2, 3], dpi=200)
+
+    # Short first-pass text is retried at 300 DPI, and the longer read wins.
+    assert results == {1: "p1 " + "x" * 30, 2: "", 3: "p3 " + "x" * 30}
+    assert sorted(rendered) == [(1, 200), (1, 300), (2, 200), (3, 200), (3, 300)]
+
+
+def test_pdf_batch_without_ocr_returns_empty_text_per_page(monkeypatch):
+    monkeypatch.setattr(ocr, "OCR_AVAILABLE", False)
+    assert ocr.extract_text_with_ocr_from_pdf_batch("doc.pdf", [1, 2]) == {1: "", 2: ""}
+
+
+def test_pdf_batch_bounds_pages_in_flight(tmp_path, monkeypatch):
+    import os
+    import threading
+    import time
+
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, peak
+
+    def render(page_number, dpi):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        return page_number, dpi
+
+    def fake_ocr(image):
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+        return "x" * 60
+
+    _stub_batch(monkeypatch, tmp_path, render)
+    monkeypatch.setattr(ocr, "_ocr_page_image", fake_ocr)
+    ocr.extract_text_with_ocr_from_pdf_batch("doc.pdf", list(range(1, 31)), max_workers=2)
+
+    workers = min(os.cpu_count() or 1, 2)
+    # Slots cover queued and running jobs; one more page may be rendered
+    # while the loop waits for a slot.
+    assert in_flight[1] <= 2 * workers + 1
+
+
+def test_pdf_batch_interleaves_retries_with_first_pass(tmp_path, monkeypatch):
+    import time
+
+    rendered = []
+
+    def render(page_number, dpi):
+        # Slow renders give each first-pass OCR time to finish.
+        time.sleep(0.05)
+        rendered.append((page_number, dpi))
+        return page_number, dpi
+
+    _stub_batch(monkeypatch, tmp_path, render)
+    ocr.extract_text_with_ocr_from_pdf_batch("doc.pdf", [1, 2, 3, 4], dpi=200)
+    assert rendered.index((1, 300)) < rendered.index((4, 200))
@@ -24,3 +24,69 @@ def test_build_citations_extracts_pages():
     assert citations[0]["page_number"] == 5
 
 
+def test_select_chunks_keeps_chunks_within_char_budget():
+    documents = ["a" * 40, "b" * 40, "c" * 40]
+    metadatas = [{"source_file": "Spec.pdf", "page_number": n} for n in (1, 2, 3)]
+    chunks = query._select_chunks(
+        documents, metadatas, ["c1", "c2", "c3"], [0.1, 0.2, 0.3], max_chars=100
+    )
+    assert [chunk["id"] for chunk in chunks] == ["c1", "c2"]
+
+
+def test_build_citations_prefers_first_chunk_per_page():
+    answer = "Cover is 50mm [Ref: Page 5]"
+    chunks = [
+        {
+            "document": "Clear cover shall be 50mm.",
+            "metadata": {"source_file": "Spec.pdf", "page_number": 5},
+        },
+        {
+            "document": "Later chunk from the same page.",
+            "metadata": {"source_file": "Spec.pdf", "page_number": 5},
+        },
+    ]
+    citations = query.build_citations(answer, chunks)
+    assert citations[0]["snippet"] == "Clear cover shall be 50mm."
+
+
+def test_find_refs_matches_flexible_markers():
+    answer = "A [Ref: Page 3], B [Ref:Page 12] C [Ref:  Page\n7] [Ref: Page ] [Ref: Page x]"
+    assert query._find_refs(answer) == [3, 12, 7]
+
+
+def test_select_chunks_skips_chunks_that_overflow():
+    documents = ["a" * 40, "b" * 90, "c" * 40]
+    metadatas = [{"source_file": "Spec.pdf", "page_number": n} for n in (1, 2, 3)]
+    chunks = query._select_chunks(
+        documents, metadatas, ["c1", "c2", "c3"], [0.3, 0.1, 0.2], max_chars=100
+    )
+    assert [chunk["id"] for chunk in chunks] == ["c2"]
+    chunks = query._select_chunks(
+        documents, metadatas, ["c1", "c2", "c3"], [0.1, 0.3, 0.2], max_chars=100
+    )
+    assert [chunk["id"] for chunk in chunks] == ["c1", "c3"]
+
+
+def test_execute_query_stream_yields_deltas_then_citations(monkeypatch):
+    chunks = [
+        {
+            "document": "Use M35 concrete for foundations.",
+            "metadata": {"source_file": "Spec.pdf", "page_number": 5},
+        }
+    ]
+    monkeypatch.setattr(query, "retrieve_chunks", lambda user_query: chunks)
+    monkeypatch.setattr(
+        query, "call_gemini_stream", lambda prompt: iter(["Use M35 ", "[Ref: Page 5]"])
+    )
+    events = list(query.execute_query_stream("Which concrete grade?"))
+    assert [event for event, _ in events] == ["delta", "delta", "citations"]
+    answer = "".join(data for event, data in events if event == "delta")
+    assert answer == "Use M35 [Ref: Page 5]"
+    assert [citation["page_number"] for citation in events[-1][1]] == [5]
+
+
+def test_execute_query_stream_without_chunks_skips_gemini(monkeypatch):
+    monkeypatch.setattr(query, "retrieve_chunks", lambda user_query: [])
+    monkeypatch.setattr(query, "call_gemini_stream", lambda prompt: 1 / 0)
+    events = list(query.execute_query_stream("Anything?"))
+    assert events == [("delta", query.NO_ANSWER_TEXT), ("citations", [])]